@@ -20,11 +20,38 @@ qctrlcirq
 
 __version__ = "0.0.5"
 
-from .circuit import convert_dds_to_cirq_circuit
+import importlib
+from typing import TYPE_CHECKING
 
-from .schedule import convert_dds_to_cirq_schedule
+if TYPE_CHECKING:
+    from .circuit import convert_dds_to_cirq_circuit, convert_dds_batch_to_cirq_circuits
+    from .schedule import convert_dds_to_cirq_schedule
 
 __all__ = [
     "convert_dds_to_cirq_circuit",
+    "convert_dds_batch_to_cirq_circuits",
     "convert_dds_to_cirq_schedule",
 ]
+
+# the converters import cirq, which is slow to load, so their modules are only
+# imported when one of them is first accessed
+_CONVERTER_MODULES = {
+    "convert_dds_to_cirq_circuit": ".circuit",
+    "convert_dds_batch_to_cirq_circuits": ".circuit",
+    "convert_dds_to_cirq_schedule": ".schedule",
+}
+
+
+def __getattr__(name):
+    """Imports the converters on first access (PEP 562)."""
+    if name in _CONVERTER_MODULES:
+        module = importlib.import_module(_CONVERTER_MODULES[name], __name__)
+        # stored so later accesses no longer go through __getattr__
+        value = globals()[name] = getattr(module, name)
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """Lists the converters along with the loaded module attributes."""
+    return sorted(set(globals()) | set(__all__))
@@ -18,6 +18,8 @@ cirq.circuit
 ============
 """
 
+from functools import lru_cache
+
 import numpy as np
 
 import cirq
@@ -29,6 +31,251 @@ from qctrlopencontrols.exceptions import ArgumentsValueError
 FIX_DURATION_UNITARY = "fixed duration unitary"
 INSTANT_UNITARY = "instant unitary"
 
+_ALGORITHMS = frozenset({FIX_DURATION_UNITARY, INSTANT_UNITARY})
+
+# target qubits used when none are given: a 1-D lattice of one qubit
+_DEFAULT_TARGET_QUBITS = (cirq.LineQubit(0),)
+
+# absolute tolerance below which a value is treated as zero (numpy.isclose default)
+_ZERO_TOLERANCE = 1e-8
+
+# gates for rotations around the x, y and z axes, in that order
+_ROTATION_GATES = (cirq.Rx, cirq.Ry, cirq.Rz)
+
+
+@lru_cache(maxsize=64)
+def _identity_moment_for(qubits):
+    """Returns the moment applying an identity to each of the qubits (a tuple)."""
+    return cirq.Moment([cirq.I(qubit) for qubit in qubits])
+
+
+@lru_cache(maxsize=64)
+def _measurement_moment_for(qubits):
+    """Returns the moment measuring each of the qubits (a tuple) under the key
+    'qubit-X', where X is the index of the qubit."""
+    return cirq.Moment(
+        [cirq.measure(qubit, key=f"qubit-{idx}") for idx, qubit in enumerate(qubits)]
+    )
+
+
+def _compute_schedule(dynamic_decoupling_sequence, gate_time, unitary_time):
+    """Computes the gates needed at each offset of a Dynamic Decoupling Sequence.
+
+    Parameters
+    ----------
+    dynamic_decoupling_sequence : DynamicDecouplingSequence
+        The dynamic decoupling sequence.
+    gate_time : float
+        Time (in seconds) delay introduced by a gate.
+    unitary_time : float
+        Time (in seconds) taken by the rotation at each offset.
+
+    Returns
+    -------
+    tuple
+        Three arrays with one entry per offset: the number of identity gates
+        placed before the offset, the axis of the rotation at the offset
+        (0, 1 or 2 for x, y or z, -1 for an identity) and the rotation angle.
+
+    Raises
+    ------
+    ArgumentsValueError
+        If the offsets cannot be placed with the given gate time, or an offset
+        holds rotations around more than one axis.
+    """
+
+    offsets = np.asarray(dynamic_decoupling_sequence.offsets)
+    rabi_rotations = np.asarray(dynamic_decoupling_sequence.rabi_rotations)
+    azimuthal_angles = np.asarray(dynamic_decoupling_sequence.azimuthal_angles)
+    detuning_rotations = np.asarray(dynamic_decoupling_sequence.detuning_rotations)
+
+    # the gap before each offset starts when the previous rotation is complete
+    gap_starts = np.concatenate(([0.0], offsets[:-1] + unitary_time))
+    offset_distances = offsets - gap_starts
+    offset_distances[np.abs(offset_distances) <= _ZERO_TOLERANCE] = 0.0
+
+    # rotation around the x, y and z axes at each offset, with shape (offsets, 3)
+    rotations = np.stack(
+        [
+            rabi_rotations * np.cos(azimuthal_angles),
+            rabi_rotations * np.sin(azimuthal_angles),
+            detuning_rotations,
+        ],
+        axis=1,
+    )
+    zero_mask = np.abs(rotations) <= _ZERO_TOLERANCE
+    zero_counts = np.sum(zero_mask, axis=1)
+
+    # the error is reported for the first offset at fault; at a given offset
+    # the spacing is checked before the rotations
+    misplaced_offsets = np.flatnonzero(offset_distances < 0)
+    invalid_offsets = np.flatnonzero(zero_counts == 1)
+    first_misplaced = misplaced_offsets[0] if misplaced_offsets.size else len(offsets)
+    first_invalid = invalid_offsets[0] if invalid_offsets.size else len(offsets)
+
+    if first_misplaced < len(offsets) and first_misplaced <= first_invalid:
+        raise ArgumentsValueError(
+            "Offsets cannot be placed properly. Spacing between the rotations"
+            "is smaller than the time required to perform the rotation. Provide"
+            "a longer dynamic decoupling sequence or shorted gate time.",
+            {
+                "dynamic_decoupling_sequence": dynamic_decoupling_sequence,
+                "gate_time": gate_time,
+            },
+        )
+
+    if first_invalid < len(offsets):
+        offset_idx = first_invalid
+        raise ArgumentsValueError(
+            "Open Controls support a sequence with one "
+            "valid rotation at any offset. Found a sequence "
+            "with multiple rotation operations at an offset.",
+            {"dynamic_decoupling_sequence": dynamic_decoupling_sequence},
+            extras={
+                "offset": offsets[offset_idx],
+                "rabi_rotation": rabi_rotations[offset_idx],
+                "azimuthal_angle": azimuthal_angles[offset_idx],
+                "detuning_rotation": detuning_rotations[offset_idx],
+            },
+        )
+
+    # number of identity gates, each lasting gate_time, filling each gap
+    identity_counts = np.floor(offset_distances / gate_time + 1e-12).astype(int)
+
+    # axis of the rotation at each offset (the first non-zero component),
+    # or -1 if the offset only holds an identity
+    rotation_axes = np.where(zero_counts == 3, -1, np.argmin(zero_mask, axis=1))
+    rotation_angles = rotations[np.arange(len(offsets)), rotation_axes]
+
+    return identity_counts, rotation_axes, rotation_angles
+
+
+def _check_sequence(dynamic_decoupling_sequence):
+    """Checks that a Dynamic Decoupling Sequence is provided.
+
+    Raises
+    ------
+    ArgumentsValueError
+        If the sequence is missing or not a DynamicDecouplingSequence.
+    """
+
+    if dynamic_decoupling_sequence is None:
+        raise ArgumentsValueError(
+            "No dynamic decoupling sequence provided.",
+            {"dynamic_decoupling_sequence": dynamic_decoupling_sequence},
+        )
+
+    if not isinstance(dynamic_decoupling_sequence, DynamicDecouplingSequence):
+        raise ArgumentsValueError(
+            "Dynamical decoupling sequence is not recognized."
+            "Expected DynamicDecouplingSequence instance",
+            {"type(dynamic_decoupling_sequence)": type(dynamic_decoupling_sequence)},
+        )
+
+
+def _check_options(target_qubits, gate_time, algorithm):
+    """Checks the conversion options shared by all sequences.
+
+    Returns
+    -------
+    tuple
+        The target qubits as a tuple (with the default applied) and the time
+        (in seconds) taken by the rotation at each offset.
+
+    Raises
+    ------
+    ArgumentsValueError
+        If the gate time or the algorithm is invalid.
+    """
+
+    if gate_time <= 0:
+        raise ArgumentsValueError(
+            "Time delay of gates must be greater than zero.", {"gate_time": gate_time}
+        )
+
+    target_qubits = tuple(target_qubits or _DEFAULT_TARGET_QUBITS)
+
+    if algorithm not in _ALGORITHMS:
+        raise ArgumentsValueError(
+            "Algorithm must be one of {} or {}".format(
+                INSTANT_UNITARY, FIX_DURATION_UNITARY
+            ),
+            {"algorithm": algorithm},
+        )
+
+    unitary_time = gate_time if algorithm == FIX_DURATION_UNITARY else 0.0
+
+    return target_qubits, unitary_time
+
+
+def _build_circuit_from_schedule(
+    dynamic_decoupling_sequence,
+    target_qubits,
+    gate_time,
+    add_measurement,
+    unitary_time,
+):
+    """Builds the circuit of a Dynamic Decoupling Sequence from checked options.
+
+    Parameters
+    ----------
+    dynamic_decoupling_sequence : DynamicDecouplingSequence
+        The dynamic decoupling sequence.
+    target_qubits : tuple
+        The target qubits for the sequence operation.
+    gate_time : float
+        Time (in seconds) delay introduced by a gate.
+    add_measurement : bool
+        If True, the circuit ends with a measurement of each target qubit.
+    unitary_time : float
+        Time (in seconds) taken by the rotation at each offset.
+
+    Returns
+    -------
+    cirq.Circuit
+        The circuit containing gates corresponding to sequence operation.
+    """
+
+    identity_counts, rotation_axes, rotation_angles = _compute_schedule(
+        dynamic_decoupling_sequence, gate_time, unitary_time
+    )
+
+    # identity moments are shared between all gaps and across calls
+    identity_moment = _identity_moment_for(target_qubits)
+
+    # the number of moments is known upfront, so the list is allocated once,
+    # filled with identities, and only the rotation (and measurement) slots
+    # are overwritten; the rotation at each offset follows its identity gates
+    rotation_slots = np.cumsum(identity_counts) + np.arange(len(identity_counts))
+    moment_count = len(identity_counts) + int(np.sum(identity_counts))
+    moments = [identity_moment] * (moment_count + int(add_measurement))
+
+    # sequences repeat the same few rotations, and moments are immutable, so
+    # each distinct rotation moment is built once and shared by its offsets
+    rotation_moments = {}
+
+    # offsets without any rotation (pure waits) keep the identity moment
+    for offset_idx in np.flatnonzero(rotation_axes != -1):
+
+        rotation = (rotation_axes[offset_idx], float(rotation_angles[offset_idx]))
+        if rotation not in rotation_moments:
+            # the gate is the same for all target qubits, so select it once
+            gate = _ROTATION_GATES[rotation[0]](rotation[1])
+            rotation_moments[rotation] = cirq.Moment(
+                [gate(qubit) for qubit in target_qubits]
+            )
+        moments[rotation_slots[offset_idx]] = rotation_moments[rotation]
+
+    if add_measurement:
+        moments[moment_count] = _measurement_moment_for(target_qubits)
+
+    # moments are disjoint by construction, each covering all target qubits, so
+    # the circuit is built in one go from them; cirq inserts ready-made moments
+    # in order, whereas appending ops makes it search for an insertion point
+    circuit = cirq.Circuit(moments)
+
+    return circuit
+
 
 def convert_dds_to_cirq_circuit(
     dynamic_decoupling_sequence,
@@ -96,117 +343,73 @@ def convert_dds_to_cirq_circuit(
     any offset.
     """
 
-    if dynamic_decoupling_sequence is None:
-        raise ArgumentsValueError(
-            "No dynamic decoupling sequence provided.",
-            {"dynamic_decoupling_sequence": dynamic_decoupling_sequence},
-        )
+    _check_sequence(dynamic_decoupling_sequence)
+    target_qubits, unitary_time = _check_options(target_qubits, gate_time, algorithm)
 
-    if not isinstance(dynamic_decoupling_sequence, DynamicDecouplingSequence):
-        raise ArgumentsValueError(
-            "Dynamical decoupling sequence is not recognized."
-            "Expected DynamicDecouplingSequence instance",
-            {"type(dynamic_decoupling_sequence)": type(dynamic_decoupling_sequence)},
-        )
+    return _build_circuit_from_schedule(
+        dynamic_decoupling_sequence,
+        target_qubits,
+        gate_time,
+        add_measurement,
+        unitary_time,
+    )
 
-    if gate_time <= 0:
-        raise ArgumentsValueError(
-            "Time delay of gates must be greater than zero.", {"gate_time": gate_time}
-        )
 
-    target_qubits = target_qubits or [cirq.LineQubit(0)]
+def convert_dds_batch_to_cirq_circuits(
+    dynamic_decoupling_sequences,
+    target_qubits=None,
+    gate_time=0.1,
+    add_measurement=True,
+    algorithm=INSTANT_UNITARY,
+):
+    """Converts several Dynamic Decoupling Sequences into quantum circuits
+    as defined in cirq
 
-    if algorithm not in [FIX_DURATION_UNITARY, INSTANT_UNITARY]:
-        raise ArgumentsValueError(
-            "Algorithm must be one of {} or {}".format(
-                INSTANT_UNITARY, FIX_DURATION_UNITARY
-            ),
-            {"algorithm": algorithm},
-        )
+    The options are checked once and shared by all sequences, along with the
+    identity and measurement moments built for the target qubits.
 
-    unitary_time = 0.0
-    if algorithm == FIX_DURATION_UNITARY:
-        unitary_time = gate_time
-
-    rabi_rotations = dynamic_decoupling_sequence.rabi_rotations
-    azimuthal_angles = dynamic_decoupling_sequence.azimuthal_angles
-    detuning_rotations = dynamic_decoupling_sequence.detuning_rotations
-
-    offsets = dynamic_decoupling_sequence.offsets
-
-    time_covered = 0
-    circuit = cirq.Circuit()
-    for offset, rabi_rotation, azimuthal_angle, detuning_rotation in zip(
-        list(offsets),
-        list(rabi_rotations),
-        list(azimuthal_angles),
-        list(detuning_rotations),
-    ):
-
-        offset_distance = offset - time_covered
-
-        if np.isclose(offset_distance, 0.0):
-            offset_distance = 0.0
-
-        if offset_distance < 0:
-            raise ArgumentsValueError(
-                "Offsets cannot be placed properly. Spacing between the rotations"
-                "is smaller than the time required to perform the rotation. Provide"
-                "a longer dynamic decoupling sequence or shorted gate time.",
-                {
-                    "dynamic_decoupling_sequence": dynamic_decoupling_sequence,
-                    "gate_time": gate_time,
-                },
-            )
+    Parameters
+    ----------
+    dynamic_decoupling_sequences : iterable
+        The dynamic decoupling sequences, each a DynamicDecouplingSequence.
+    target_qubits : list, optional
+        List of target qubits for the sequence operations; the qubits must be
+        cirq.Qid type; defaults to None in which case a 1-D lattice of one
+        qubit is used (indexed as 0).
+    gate_time : float, optional
+        Time (in seconds) delay introduced by a gate; defaults to 0.1
+    add_measurement : bool, optional
+        If True, each circuit contains a measurement operation for each of the
+        target qubits. See `convert_dds_to_cirq_circuit`.
+    algorithm : str, optional
+        One of 'fixed duration unitary' or 'instant unitary'. See
+        `convert_dds_to_cirq_circuit`. Defaults to 'instant unitary'.
 
-        while (time_covered + gate_time) <= offset:
-            gate_list = []
-            for qubit in target_qubits:
-                gate_list.append(cirq.I(qubit))
-            time_covered += gate_time
-            circuit.append(gate_list)
-
-        rotations = np.array(
-            [
-                rabi_rotation * np.cos(azimuthal_angle),
-                rabi_rotation * np.sin(azimuthal_angle),
-                detuning_rotation,
-            ]
-        )
+    Returns
+    -------
+    list
+        The circuits (cirq.Circuit) for the sequences, in the same order.
 
-        if np.sum(np.isclose(rotations, 0.0).astype(int)) == 1:
-            raise ArgumentsValueError(
-                "Open Controls support a sequence with one "
-                "valid rotation at any offset. Found a sequence "
-                "with multiple rotation operations at an offset.",
-                {"dynamic_decoupling_sequence": dynamic_decoupling_sequence},
-                extras={
-                    "offset": offset,
-                    "rabi_rotation": rabi_rotation,
-                    "azimuthal_angle": azimuthal_angle,
-                    "detuning_rotation": detuning_rotation,
-                },
-            )
+    Raises
+    ------
+    ArgumentsValueError
+        If any of the input parameters result in an invalid operation.
+    """
 
-        gate_list = []
-        for qubit in target_qubits:
-            if np.sum(np.isclose(rotations, 0.0).astype(int)) == 3:
-                gate_list.append(cirq.I(qubit))
-            else:
-                if not np.isclose(rotations[0], 0.0):
-                    gate_list.append(cirq.Rx(rotations[0])(qubit))
-                elif not np.isclose(rotations[1], 0.0):
-                    gate_list.append(cirq.Ry(rotations[1])(qubit))
-                elif not np.isclose(rotations[2], 0.0):
-                    gate_list.append(cirq.Rz(rotations[2])(qubit))
-        circuit.append(gate_list)
-
-        time_covered = offset + unitary_time
+    # the sequences are iterated twice, so iterators are consumed up front
+    dynamic_decoupling_sequences = list(dynamic_decoupling_sequences)
 
-    if add_measurement:
-        gate_list = []
-        for idx, qubit in enumerate(target_qubits):
-            gate_list.append(cirq.measure(qubit, key="qubit-{}".format(idx)))
-        circuit.append(gate_list)
+    for dynamic_decoupling_sequence in dynamic_decoupling_sequences:
+        _check_sequence(dynamic_decoupling_sequence)
+    target_qubits, unitary_time = _check_options(target_qubits, gate_time, algorithm)
 
-    return circuit
+    return [
+        _build_circuit_from_schedule(
+            dynamic_decoupling_sequence,
+            target_qubits,
+            gate_time,
+            add_measurement,
+            unitary_time,
+        )
+        for dynamic_decoupling_sequence in dynamic_decoupling_sequences
+    ]
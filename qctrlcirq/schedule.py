@@ -25,6 +25,8 @@ import cirq
 from qctrlopencontrols import DynamicDecouplingSequence
 from qctrlopencontrols.exceptions import ArgumentsValueError
 
+from .circuit import _DEFAULT_TARGET_QUBITS, _ZERO_TOLERANCE
+
 
 def convert_dds_to_cirq_schedule(
     dynamic_decoupling_sequence,
@@ -105,7 +107,7 @@ def convert_dds_to_cirq_schedule(
             "Time delay of gates must be greater than zero.", {"gate_time": gate_time}
         )
 
-    target_qubits = target_qubits or [cirq.LineQubit(0)]
+    target_qubits = target_qubits or _DEFAULT_TARGET_QUBITS
     device = device or cirq.devices.UNCONSTRAINED_DEVICE
 
     if not isinstance(device, cirq.Device):
@@ -147,7 +149,10 @@ def convert_dds_to_cirq_schedule(
             ]
         )
 
-        if np.sum(np.isclose(rotations, 0.0).astype(int)) == 1:
+        zero_mask = np.abs(rotations) <= _ZERO_TOLERANCE
+        zero_count = int(zero_mask.sum())
+
+        if zero_count == 1:
             raise ArgumentsValueError(
                 "Open Controls support a sequence with one"
                 "valid pulse at any offset. Found sequence"
@@ -166,26 +171,26 @@ def convert_dds_to_cirq_schedule(
             )
 
         for qubit in target_qubits:
-            if np.sum(np.isclose(rotations, 0.0).astype(int)) == 0:
+            if zero_count == 0:
                 operation = cirq.ScheduledOperation(
                     time=cirq.Timestamp(nanos=offsets[op_idx]),
                     duration=cirq.Duration(nanos=gate_time),
                     operation=cirq.I(qubit),
                 )
             else:
-                if not np.isclose(rotations[0], 0.0):
+                if not zero_mask[0]:
                     operation = cirq.ScheduledOperation(
                         time=cirq.Timestamp(nanos=offsets[op_idx]),
                         duration=cirq.Duration(nanos=gate_time),
                         operation=cirq.Rx(rotations[0])(qubit),
                     )
-                elif not np.isclose(rotations[1], 0.0):
+                elif not zero_mask[1]:
                     operation = cirq.ScheduledOperation(
                         time=cirq.Timestamp(nanos=offsets[op_idx]),
                         duration=cirq.Duration(nanos=gate_time),
                         operation=cirq.Rx(rotations[1])(qubit),
                     )
-                elif not np.isclose(rotations[2], 0.0):
+                elif not zero_mask[2]:
                     operation = cirq.ScheduledOperation(
                         time=cirq.Timestamp(nanos=offsets[op_idx]),
                         duration=cirq.Duration(nanos=gate_time),
@@ -195,13 +200,16 @@ def convert_dds_to_cirq_schedule(
             scheduled_operations.append(operation)
 
     if add_measurement:
-        for idx, qubit in enumerate(target_qubits):
-            operation = cirq.ScheduledOperation(
-                time=cirq.Timestamp(nanos=offsets[-1] + gate_time),
-                duration=cirq.Duration(nanos=gate_time),
-                operation=cirq.MeasurementGate(1, key="qubit-{}".format(idx))(qubit),
-            )
-            scheduled_operations.append(operation)
+        scheduled_operations.extend(
+            [
+                cirq.ScheduledOperation(
+                    time=cirq.Timestamp(nanos=offsets[-1] + gate_time),
+                    duration=cirq.Duration(nanos=gate_time),
+                    operation=cirq.MeasurementGate(1, key=f"qubit-{idx}")(qubit),
+                )
+                for idx, qubit in enumerate(target_qubits)
+            ]
+        )
 
     schedule = cirq.Schedule(device=device, scheduled_operations=scheduled_operations)
     return schedule
@@ -18,10 +18,20 @@ Tests converstion to Cirq Circuit
 ===================================
 """
 
+import os
+import subprocess
+import sys
+
 import cirq
 import numpy as np
-from qctrlcirq import convert_dds_to_cirq_circuit, convert_dds_to_cirq_schedule
+import pytest
+from qctrlcirq import (
+    convert_dds_batch_to_cirq_circuits,
+    convert_dds_to_cirq_circuit,
+    convert_dds_to_cirq_schedule,
+)
 from qctrlopencontrols import (
+    DynamicDecouplingSequence,
     new_carr_purcell_sequence,
     new_cpmg_sequence,
     new_periodic_sequence,
@@ -32,6 +42,7 @@ from qctrlopencontrols import (
     new_x_concatenated_sequence,
     new_xy_concatenated_sequence,
 )
+from qctrlopencontrols.exceptions import ArgumentsValueError
 
 _callable = {
     "Spin echo": new_spin_echo_sequence,
@@ -138,5 +149,142 @@ def test_cirq_circuit_operation():
     _check_circuit_output(True, convert_dds_to_cirq_schedule, 0)
 
 
+def test_cirq_circuit_batch_conversion():
+
+    """Tests if converting a batch of Dynamic Decoupling Sequences gives
+    the same circuits as converting each sequence on its own
+    """
+    sequences = [
+        _create_test_sequence(sequence_scheme, True)
+        for sequence_scheme in [
+            "Carr-Purcell",
+            "Uhrig single-axis",
+            "Walsh single-axis",
+            "XY concatenated",
+        ]
+    ]
+    target_qubits = cirq.LineQubit.range(2)
+
+    # a generator checks that the sequences are not consumed by the validation
+    cirq_circuits = convert_dds_batch_to_cirq_circuits(
+        (sequence for sequence in sequences),
+        target_qubits=target_qubits,
+        gate_time=0.2,
+        algorithm="fixed duration unitary",
+    )
+
+    assert len(cirq_circuits) == len(sequences)
+
+    # Carr-Purcell: pi/2 rotation at 0, pi rotations at 1 and 3, pi/2 rotation
+    # at 4, each lasting gate_time, with 4, 9 and 4 identities in between
+    assert len(cirq_circuits[0]) == 22
+    assert cirq_circuits[0][-1] == cirq.Moment(
+        [
+            cirq.measure(target_qubits[0], key="qubit-0"),
+            cirq.measure(target_qubits[1], key="qubit-1"),
+        ]
+    )
+
+    for sequence, cirq_circuit in zip(sequences, cirq_circuits):
+        assert cirq_circuit == convert_dds_to_cirq_circuit(
+            sequence,
+            target_qubits=target_qubits,
+            gate_time=0.2,
+            algorithm="fixed duration unitary",
+        )
+
+    # a single invalid item fails the whole batch
+    with pytest.raises(ArgumentsValueError):
+        convert_dds_batch_to_cirq_circuits(sequences + [None])
+    with pytest.raises(ArgumentsValueError):
+        convert_dds_batch_to_cirq_circuits([sequences[0], "not a sequence"])
+
+
+def test_cirq_circuit_identity_count():
+
+    """Tests if the gap before each offset is filled with
+    floor(offset_distance / gate_time) identity gates, including gaps that
+    are exact multiples of gate_time
+    """
+    qubit = cirq.LineQubit(0)
+    sequence = DynamicDecouplingSequence(
+        duration=3,
+        offsets=[0.3, 2.0],
+        rabi_rotations=[np.pi, np.pi],
+        azimuthal_angles=[0.0, 0.0],
+        detuning_rotations=[0.0, 0.0],
+    )
+
+    def _expected_circuit(first_gap_count, second_gap_count):
+        identity = cirq.Moment([cirq.I(qubit)])
+        rotation = cirq.Moment([cirq.Rx(np.pi)(qubit)])
+        measurement = cirq.Moment([cirq.measure(qubit, key="qubit-0")])
+        return cirq.Circuit(
+            [identity] * first_gap_count
+            + [rotation]
+            + [identity] * second_gap_count
+            + [rotation, measurement]
+        )
+
+    # gaps of 0.3 and 1.7
+    cirq_circuit = convert_dds_to_cirq_circuit(
+        sequence, gate_time=0.1, algorithm="instant unitary"
+    )
+    assert len(cirq_circuit) == 23
+    assert cirq_circuit == _expected_circuit(3, 17)
+
+    # gaps of 0.3 and 1.6, as each rotation lasts gate_time
+    cirq_circuit = convert_dds_to_cirq_circuit(
+        sequence, gate_time=0.1, algorithm="fixed duration unitary"
+    )
+    assert len(cirq_circuit) == 22
+    assert cirq_circuit == _expected_circuit(3, 16)
+
+
+def test_cirq_circuit_error_order():
+
+    """Tests if the error raised for an invalid sequence is the one for the
+    first offset at fault
+    """
+    # the first offset rotates around two axes, the second is too close to it
+    sequence = DynamicDecouplingSequence(
+        duration=2,
+        offsets=[1.0, 1.05],
+        rabi_rotations=[1.0, np.pi],
+        azimuthal_angles=[0.5, 0.0],
+        detuning_rotations=[0.0, 0.0],
+    )
+    with pytest.raises(ArgumentsValueError, match="multiple rotation operations"):
+        convert_dds_to_cirq_circuit(sequence, algorithm="fixed duration unitary")
+
+    # the second offset is too close to the first, the third rotates around two axes
+    sequence = DynamicDecouplingSequence(
+        duration=2,
+        offsets=[1.0, 1.05, 1.5],
+        rabi_rotations=[np.pi, np.pi, 1.0],
+        azimuthal_angles=[0.0, 0.0, 0.5],
+        detuning_rotations=[0.0, 0.0, 0.0],
+    )
+    with pytest.raises(ArgumentsValueError, match="Offsets cannot be placed"):
+        convert_dds_to_cirq_circuit(sequence, algorithm="fixed duration unitary")
+
+
+def test_import_does_not_load_cirq():
+
+    """Tests if importing the package leaves cirq unloaded until a converter
+    is accessed
+    """
+    script = (
+        "import sys; import qctrlcirq; "
+        "assert 'cirq' not in sys.modules; "
+        "qctrlcirq.convert_dds_to_cirq_circuit; "
+        "assert 'cirq' in sys.modules; "
+        "assert 'convert_dds_to_cirq_circuit' in vars(qctrlcirq)"
+    )
+    # run from the repository root so the package is importable uninstalled
+    repository_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", script], check=True, cwd=repository_root)
+
+
 if __name__ == "__main__":
     pass